@@ -4,6 +4,8 @@ from typing import TextIO
 from ..utils.path import get_executable_path
 from ..models.shell_context import ShellContext
 from ..models.redirect import FileMode
+from ..utils.output_writer import output_writer
+from ..utils.metrics import metrics
 
 # Constants
 HOME_DIR_SYMBOL = "~"
@@ -11,6 +13,31 @@ HISTORY_FLAG_READ = "-r"
 HISTORY_FLAG_WRITE = "-w"
 HISTORY_FLAG_APPEND = "-a"
 HISTORY_FLAGS = {HISTORY_FLAG_READ, HISTORY_FLAG_WRITE, HISTORY_FLAG_APPEND}
+SHELLSTAT_FLAG_JSON = "--json"
+
+class BuiltinError(str):
+    """Output of a builtin that failed; displayed like any output, but exits with status 1."""
+
+class ControlFlow(Exception):
+    """Raised by break, continue and return to unwind to the loop or function handling it."""
+
+class BreakLoop(ControlFlow):
+    """Leave the innermost `levels` enclosing loops."""
+    def __init__(self, levels: int = 1):
+        super().__init__(levels)
+        self.levels = levels
+
+class ContinueLoop(ControlFlow):
+    """Start the next iteration of the `levels`-th enclosing loop."""
+    def __init__(self, levels: int = 1):
+        super().__init__(levels)
+        self.levels = levels
+
+class ReturnFromFunction(ControlFlow):
+    """Leave the running function with an exit status."""
+    def __init__(self, status: int):
+        super().__init__(status)
+        self.status = status
 
 # Note: All builtin handlers accept a 'context' parameter for consistency,
 # even if not all handlers use it. This allows for a uniform function signature
@@ -19,6 +46,17 @@ HISTORY_FLAGS = {HISTORY_FLAG_READ, HISTORY_FLAG_WRITE, HISTORY_FLAG_APPEND}
 # Return type convention (str | None):
 # - None: Success with no output to display
 # - str: Output to display (normal output or error message)
+# - BuiltinError: Error message to display; the command's exit status is 1
+
+def _handle_break(  # pylint: disable=unused-argument
+    arguments: list[str],
+    stdin: TextIO | None = None,
+    context: ShellContext | None = None
+) -> str | None:
+    levels = _parse_loop_levels("break", arguments, context)
+    if isinstance(levels, BuiltinError):
+        return levels
+    raise BreakLoop(levels)
 
 def _handle_cd(  # pylint: disable=unused-argument
     arguments: list[str],
@@ -26,7 +64,7 @@ def _handle_cd(  # pylint: disable=unused-argument
     context: ShellContext | None = None
 ) -> str | None:
     if len(arguments) == 0:
-        return "cd: missing argument\n"
+        return BuiltinError("cd: missing argument\n")
 
     if arguments[0] == HOME_DIR_SYMBOL:
         arguments[0] = os.path.expanduser(HOME_DIR_SYMBOL)
@@ -35,13 +73,23 @@ def _handle_cd(  # pylint: disable=unused-argument
 
     absolute_path = os.path.abspath(arguments[0])
     if not os.path.exists(absolute_path) or not os.path.isdir(absolute_path):
-        return f"cd: {arguments[0]}: No such file or directory\n"
+        return BuiltinError(f"cd: {arguments[0]}: No such file or directory\n")
 
     os.chdir(absolute_path)
     if context:
         context.working_dir = os.getcwd()
     return None
 
+def _handle_continue(  # pylint: disable=unused-argument
+    arguments: list[str],
+    stdin: TextIO | None = None,
+    context: ShellContext | None = None
+) -> str | None:
+    levels = _parse_loop_levels("continue", arguments, context)
+    if isinstance(levels, BuiltinError):
+        return levels
+    raise ContinueLoop(levels)
+
 def _handle_echo(  # pylint: disable=unused-argument
     arguments: list[str],
     stdin: TextIO | None = None,
@@ -61,8 +109,16 @@ def _handle_exit(  # pylint: disable=unused-argument
         histfile = context.history.get_histfile()
         if histfile:
             context.history.write_to_file(histfile, mode=FileMode.WRITE.value)
+    output_writer.close()
     sys.exit(0)
 
+def _handle_false(  # pylint: disable=unused-argument
+    _arguments: list[str],
+    stdin: TextIO | None = None,
+    context: ShellContext | None = None
+) -> str | None:
+    return BuiltinError("")
+
 def _handle_history(  # pylint: disable=unused-argument
     arguments: list[str],
     stdin: TextIO | None = None,
@@ -79,7 +135,7 @@ def _handle_history(  # pylint: disable=unused-argument
 
     if flag_or_num in HISTORY_FLAGS:
         if len(arguments) < 2:
-            return f"history: {flag_or_num} requires a file path\n"
+            return BuiltinError(f"history: {flag_or_num} requires a file path\n")
 
         file_path = arguments[1]
         if flag_or_num == HISTORY_FLAG_READ:
@@ -103,6 +159,37 @@ def _handle_pwd(  # pylint: disable=unused-argument
         return context.working_dir + "\n"
     return os.getcwd() + "\n"
 
+def _handle_return(  # pylint: disable=unused-argument
+    arguments: list[str],
+    stdin: TextIO | None = None,
+    context: ShellContext | None = None
+) -> str | None:
+    if context is None or context.scope.function_depth == 0:
+        return BuiltinError("return: can only `return' from a function\n")
+    if not arguments:
+        raise ReturnFromFunction(context.last_status)
+    if not arguments[0].lstrip("-").isdigit():
+        return BuiltinError(f"return: {arguments[0]}: numeric argument required\n")
+    raise ReturnFromFunction(int(arguments[0]) % 256)
+
+def _handle_shellstat(  # pylint: disable=unused-argument
+    arguments: list[str],
+    stdin: TextIO | None = None,
+    context: ShellContext | None = None
+) -> str | None:
+    if not arguments:
+        return metrics.format_human()
+    if arguments == [SHELLSTAT_FLAG_JSON]:
+        return metrics.format_json()
+    return BuiltinError(f"shellstat: usage: shellstat [{SHELLSTAT_FLAG_JSON}]\n")
+
+def _handle_true(  # pylint: disable=unused-argument
+    _arguments: list[str],
+    stdin: TextIO | None = None,
+    context: ShellContext | None = None
+) -> str | None:
+    return None
+
 def _process_type_line(line: str) -> str:
     """Helper to process a single line for type command."""
     line = line.strip()
@@ -146,14 +233,39 @@ def _handle_type(  # pylint: disable=unused-argument
 
     return "".join(output_lines) if output_lines else None
 
+def _parse_loop_levels(
+    name: str,
+    arguments: list[str],
+    context: ShellContext | None
+) -> int | BuiltinError:
+    """Get how many loops break/continue applies to, capped at the loop depth."""
+    loop_depth = context.scope.loop_depth if context else 0
+    if loop_depth == 0:
+        return BuiltinError(f"{name}: only meaningful in a `for', `while', or `until' loop\n")
+    if not arguments:
+        return 1
+    if not arguments[0].isdigit() or int(arguments[0]) == 0:
+        return BuiltinError(f"{name}: {arguments[0]}: loop count out of range\n")
+    return min(int(arguments[0]), loop_depth)
+
 builtin_handlers = {
+    "break": _handle_break,
     "cd": _handle_cd,
+    "continue": _handle_continue,
     "echo": _handle_echo,
     "exit": _handle_exit,
+    "false": _handle_false,
     "history": _handle_history,
     "pwd": _handle_pwd,
+    "return": _handle_return,
+    "shellstat": _handle_shellstat,
+    "true": _handle_true,
     "type": _handle_type,
 }
 
 def is_builtin(command: str) -> bool:
     return command in builtin_handlers
+
+def get_exit_status(output: str | None) -> int:
+    """Get the exit status of a builtin from its handler's return value."""
+    return 1 if isinstance(output, BuiltinError) else 0
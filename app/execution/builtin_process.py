@@ -1,13 +1,18 @@
 import os
 import io
 from ..models.redirect import FileMode
+from ..utils.metrics import metrics
+
+_PIPE_BYTES = metrics.counter(
+    "shell_builtin_pipe_bytes_total", "Bytes written by builtins into pipeline pipes"
+)
 
 class BuiltinProcess:
     """Wrapper to mimic subprocess.Popen interface for builtin commands."""
 
-    def __init__(self, output: str, needs_pipe: bool = False):
+    def __init__(self, output: str, needs_pipe: bool = False, returncode: int = 0):
         self._output = output
-        self.returncode = 0
+        self.returncode = returncode
 
         if needs_pipe:
             # Create a real pipe for the next command to read from
@@ -15,6 +20,7 @@ class BuiltinProcess:
             # Write output to the write end and close it
             with os.fdopen(write_fd, FileMode.WRITE.value) as write_file:
                 write_file.write(output)
+            _PIPE_BYTES.inc(len(output.encode()))
             # Return the read end as stdout
             self.stdout = os.fdopen(read_fd, "r")
         else:
@@ -1,7 +1,7 @@
 import subprocess
 from typing import TextIO
 from ..utils.path import get_executable_path
-from ..models.redirect import Redirect
+from ..models.redirect import Redirect, InputRedirect
 from ..models.shell_context import ShellContext
 from .command_executor import CommandExecutor
 from .pipe_executor import PipeExecutor
@@ -10,17 +10,24 @@ from .builtin_process import BuiltinProcess
 
 class Command:
     """Represents a shell command with arguments and redirection."""
-    def __init__(self, command: str, arguments: list[str], redirects: Redirect):
+    def __init__(
+        self,
+        command: str,
+        arguments: list[str],
+        redirects: Redirect,
+        input_redirect: InputRedirect | None = None
+    ):
         self.command = command
         self.arguments = arguments
         self.redirect = redirects
+        self.input_redirect = input_redirect
         self.executable_path = get_executable_path(command)
         self._command_executor = CommandExecutor()
         self._pipe_executor = PipeExecutor()
 
-    def execute(self, context: ShellContext | None = None) -> None:
-        """Execute this command with output redirection."""
-        self._command_executor.execute(self, context)
+    def execute(self, context: ShellContext | None = None) -> int:
+        """Execute this command with redirection, returning its exit status."""
+        return self._command_executor.execute(self, context)
 
     def execute_with_pipe(
         self,
@@ -1,59 +1,111 @@
 import subprocess
 import sys
-from typing import TYPE_CHECKING
-from ..builtins.handlers import is_builtin, builtin_handlers
+from typing import TextIO, TYPE_CHECKING
+from ..builtins.handlers import is_builtin, builtin_handlers, get_exit_status
 from ..models.redirect import RedirectionType
 from ..models.shell_context import ShellContext
-from ..utils.output import handle_output, _ensure_directory_exists
+from ..utils.input_source import open_input
+from ..utils.metrics import metrics
+from ..utils.output import handle_output
+from ..utils.output_writer import output_writer
 from ..utils.subprocess_utils import build_subprocess_kwargs
 
 if TYPE_CHECKING:
     from .command import Command
 
+# Constants
+FAILURE_STATUS = 1
+NOT_FOUND_STATUS = 127
+
+# Shared with PipeExecutor, so pipeline stages are counted too
+BUILTIN_COMMANDS = metrics.counter(
+    "shell_builtin_commands_total", "Builtin commands run, standalone or in a pipeline"
+)
+EXTERNAL_COMMANDS = metrics.counter(
+    "shell_external_commands_total", "External commands run, standalone or in a pipeline"
+)
+NOT_FOUND_COMMANDS = metrics.counter(
+    "shell_not_found_commands_total", "Commands not found, standalone or in a pipeline"
+)
+# Pipeline stages run concurrently, so they are timed by shell_pipeline_seconds instead
+_COMMAND_SECONDS = metrics.histogram(
+    "shell_standalone_command_seconds",
+    "Time to run a command outside a pipeline, including redirects"
+)
+
 
 class CommandExecutor:
     """Executes a command with redirects (standalone execution)."""
 
-    def execute(self, command: "Command", context: ShellContext | None = None) -> None:
-        """Execute a command with output redirection."""
+    def execute(self, command: "Command", context: ShellContext | None = None) -> int:
+        """Execute a command with input and output redirection, returning its exit status."""
         if not command.command:
-            return
+            return 0
+
+        if command.input_redirect is None:
+            return self._dispatch(command, None, context)
+
+        try:
+            stdin = open_input(command.input_redirect)
+        except OSError as error:
+            sys.stderr.write(f"shell: {command.input_redirect.source}: {error.strerror}\n")
+            sys.stderr.flush()
+            return FAILURE_STATUS
+        with stdin:
+            return self._dispatch(command, stdin, context)
 
-        if is_builtin(command.command):
-            self._execute_builtin(command, context)
-        elif command.executable_path:
-            self._execute_external(command)
-        else:
-            self._execute_not_found(command)
+    def _dispatch(
+        self,
+        command: "Command",
+        stdin: TextIO | None,
+        context: ShellContext | None
+    ) -> int:
+        with _COMMAND_SECONDS.time():
+            if is_builtin(command.command):
+                BUILTIN_COMMANDS.inc()
+                return self._execute_builtin(command, stdin, context)
+            if command.executable_path:
+                EXTERNAL_COMMANDS.inc()
+                return self._execute_external(command, stdin)
+            NOT_FOUND_COMMANDS.inc()
+            return self._execute_not_found(command)
 
-    def _execute_builtin(self, command: "Command", context: ShellContext | None = None) -> None:
+    def _execute_builtin(
+        self,
+        command: "Command",
+        stdin: TextIO | None = None,
+        context: ShellContext | None = None
+    ) -> int:
         """Execute a builtin command."""
-        output = builtin_handlers[command.command](command.arguments, context=context)
+        output = builtin_handlers[command.command](command.arguments, stdin=stdin, context=context)
         handle_output(output, command.redirect)
+        return get_exit_status(output)
 
-    def _execute_external(self, command: "Command") -> None:
+    def _execute_external(self, command: "Command", stdin: TextIO | None = None) -> int:
         """Execute an external command."""
         if command.redirect.type in (RedirectionType.STDOUT, RedirectionType.STDERR):
-            self._execute_with_file_redirect(command)
-        else:
-            subprocess.run(**build_subprocess_kwargs(command), check=False)
+            return self._execute_with_file_redirect(command, stdin)
+        kwargs = build_subprocess_kwargs(command, stdin=stdin)
+        return subprocess.run(**kwargs, check=False).returncode
 
-    def _execute_not_found(self, command: "Command") -> None:
+    def _execute_not_found(self, command: "Command") -> int:
         """Handle command not found error."""
         output = f"{command.command}: not found\n"
         handle_output(output, command.redirect)
+        return NOT_FOUND_STATUS
 
-    def _execute_with_file_redirect(self, command: "Command") -> None:
+    def _execute_with_file_redirect(self, command: "Command", stdin: TextIO | None = None) -> int:
         """Execute external command with file redirection."""
         try:
-            _ensure_directory_exists(command.redirect.file)
-            with open(command.redirect.file, command.redirect.mode.value, encoding="utf-8") as file:
-                kwargs = build_subprocess_kwargs(command)
-                if command.redirect.type == RedirectionType.STDOUT:
-                    kwargs["stdout"] = file
-                elif command.redirect.type == RedirectionType.STDERR:
-                    kwargs["stderr"] = file
-                subprocess.run(**kwargs, check=False)
+            file = output_writer.open_redirect(command.redirect.file, command.redirect.mode)
+            kwargs = build_subprocess_kwargs(command, stdin=stdin)
+            if command.redirect.type == RedirectionType.STDOUT:
+                kwargs["stdout"] = file
+            elif command.redirect.type == RedirectionType.STDERR:
+                kwargs["stderr"] = file
+            return subprocess.run(**kwargs, check=False).returncode
         except (PermissionError, OSError) as error:
+            output_writer.close()
             sys.stderr.write(f"shell: cannot redirect to '{command.redirect.file}': {error}\n")
             sys.stderr.flush()
+            return FAILURE_STATUS
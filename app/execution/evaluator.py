@@ -0,0 +1,197 @@
+from dataclasses import replace
+from ..builtins.handlers import BreakLoop, ContinueLoop, ReturnFromFunction
+from ..models.shell_context import Scope, ShellContext
+from ..models.word import ExpandableWord, expand_word
+from ..parsing.lexer import ShellSyntaxError
+from ..utils.fd_redirection import FdRedirection
+from .command import Command
+from .command_executor import FAILURE_STATUS
+from .pipeline import Pipeline
+from .syntax_tree import (
+    AndOr,
+    Assignment,
+    For,
+    FunctionDef,
+    If,
+    PipelineNode,
+    Sequence,
+    SimpleCommand,
+    While,
+)
+
+
+class Evaluator:
+    """Runs a compiled syntax tree by walking it, returning exit statuses."""
+
+    def __init__(self):
+        self._handlers = {
+            SimpleCommand: self._run_simple_command,
+            Assignment: self._run_assignment,
+            PipelineNode: self._run_pipeline,
+            Sequence: self._run_sequence,
+            AndOr: self._run_and_or,
+            If: self._run_if,
+            While: self._run_while,
+            For: self._run_for,
+            FunctionDef: self._run_function_def,
+        }
+
+    def execute(self, node: object, context: ShellContext) -> int:
+        """Run a node, recording and returning its exit status."""
+        status = self._handlers[type(node)](node, context)
+        context.last_status = status
+        return status
+
+    def _run_simple_command(self, node: SimpleCommand, context: ShellContext) -> int:
+        function = self._find_function(node, context)
+        if function is not None:
+            return self._call_function(function, node, context)
+        return self._prepare(node, context).execute(context)
+
+    def _find_function(self, node: SimpleCommand, context: ShellContext) -> FunctionDef | None:
+        return context.functions.get(expand_word(node.command.command, context.get_variable))
+
+    def _prepare(self, node: SimpleCommand, context: ShellContext) -> Command:
+        """Get the node's Command ready to run, expanding words if it has any."""
+        command = node.command
+        if not node.dynamic:
+            return command
+
+        lookup = context.get_variable
+        if isinstance(command.command, ExpandableWord):
+            # Only a variable command name needs a new Command (and PATH lookup)
+            command = Command(command.command.expand(lookup), [], node.redirect)
+        command.arguments = [expand_word(argument, lookup) for argument in node.arguments]
+        command.redirect = node.redirect
+        if isinstance(node.redirect.file, ExpandableWord):
+            command.redirect = replace(node.redirect, file=node.redirect.file.expand(lookup))
+        command.input_redirect = node.input_redirect
+        if node.input_redirect is not None:
+            source = expand_word(node.input_redirect.source, lookup)
+            body = expand_word(node.input_redirect.body, lookup)
+            if source is not node.input_redirect.source or body is not node.input_redirect.body:
+                command.input_redirect = replace(node.input_redirect, source=source, body=body)
+        return command
+
+    def _call_function(
+        self,
+        function: FunctionDef,
+        node: SimpleCommand,
+        context: ShellContext
+    ) -> int:
+        """Run a function body with the call's arguments and redirects."""
+        command = self._prepare(node, context)
+        redirection = FdRedirection(command.redirect, command.input_redirect)
+        if not redirection.apply():
+            return FAILURE_STATUS
+
+        caller_scope = context.scope
+        context.scope = Scope(
+            list(command.arguments), caller_scope.loop_depth, caller_scope.function_depth + 1
+        )
+        try:
+            return self.execute(function.body, context)
+        except ReturnFromFunction as signal:
+            return signal.status
+        finally:
+            context.scope = caller_scope
+            redirection.restore()
+
+    def _run_assignment(self, node: Assignment, context: ShellContext) -> int:
+        for name, value in node.assignments:
+            context.variables[name] = expand_word(value, context.get_variable)
+        return 0
+
+    def _run_pipeline(self, node: PipelineNode, context: ShellContext) -> int:
+        """Run a pipeline of simple commands.
+
+        Raises ShellSyntaxError if a stage calls a function, since stages
+        can't run shell code concurrently.
+        """
+        for stage in node.stages:
+            function = self._find_function(stage, context)
+            if function is not None:
+                raise ShellSyntaxError(f"{function.name}: functions cannot be used in a pipeline")
+        return Pipeline([self._prepare(stage, context) for stage in node.stages]).execute(context)
+
+    def _run_sequence(self, node: Sequence, context: ShellContext) -> int:
+        status = context.last_status
+        for child in node.nodes:
+            status = self.execute(child, context)
+        return status
+
+    def _run_and_or(self, node: AndOr, context: ShellContext) -> int:
+        status = self.execute(node.left, context)
+        if (status == 0) == node.is_and:
+            return self.execute(node.right, context)
+        return status
+
+    def _run_if(self, node: If, context: ShellContext) -> int:
+        for condition, body in node.branches:
+            if self.execute(condition, context) == 0:
+                return self.execute(body, context)
+        if node.else_body is not None:
+            return self.execute(node.else_body, context)
+        return 0
+
+    def _run_while(self, node: While, context: ShellContext) -> int:
+        status = 0
+        context.scope.loop_depth += 1
+        try:
+            while True:
+                # break/continue can run in the condition too; continue re-tests it
+                try:
+                    condition = self.execute(node.condition, context)
+                except BreakLoop as signal:
+                    self._unwind(signal)
+                    return 0
+                except ContinueLoop as signal:
+                    self._unwind(signal)
+                    continue
+                if (condition == 0) == node.until:
+                    break
+                status = self._run_iteration(node.body, context)
+                if status is None:
+                    return 0
+        finally:
+            context.scope.loop_depth -= 1
+        return status
+
+    def _run_for(self, node: For, context: ShellContext) -> int:
+        if node.words is None:
+            values = list(context.scope.positional_args)
+        else:
+            values = [expand_word(word, context.get_variable) for word in node.words]
+
+        status = 0
+        context.scope.loop_depth += 1
+        try:
+            for value in values:
+                context.variables[node.name] = value
+                status = self._run_iteration(node.body, context)
+                if status is None:
+                    return 0
+        finally:
+            context.scope.loop_depth -= 1
+        return status
+
+    def _run_iteration(self, body: object, context: ShellContext) -> int | None:
+        """Run one pass of a loop body, returning None if break ends this loop."""
+        try:
+            return self.execute(body, context)
+        except BreakLoop as signal:
+            self._unwind(signal)
+            return None
+        except ContinueLoop as signal:
+            self._unwind(signal)
+            return 0
+
+    def _unwind(self, signal: BreakLoop | ContinueLoop) -> None:
+        """Re-raise a break/continue aimed at an outer loop, counting this one."""
+        if signal.levels > 1:
+            signal.levels -= 1
+            raise signal
+
+    def _run_function_def(self, node: FunctionDef, context: ShellContext) -> int:
+        context.functions[node.name] = node
+        return 0
@@ -1,9 +1,19 @@
 import subprocess
+import sys
 from typing import TextIO, TYPE_CHECKING
-from ..builtins.handlers import is_builtin, builtin_handlers
+from ..builtins.handlers import ControlFlow, is_builtin, builtin_handlers, get_exit_status
 from ..models.shell_context import ShellContext
+from ..utils.input_source import open_input
+from ..utils.output import write_stdout
 from ..utils.subprocess_utils import build_subprocess_kwargs
 from .builtin_process import BuiltinProcess
+from .command_executor import (
+    BUILTIN_COMMANDS,
+    EXTERNAL_COMMANDS,
+    FAILURE_STATUS,
+    NOT_FOUND_COMMANDS,
+    NOT_FOUND_STATUS,
+)
 
 if TYPE_CHECKING:
     from .command import Command
@@ -20,8 +30,38 @@ class PipeExecutor:
         stderr: TextIO | int | None = None,
         context: ShellContext | None = None
     ) -> BuiltinProcess | subprocess.Popen:
-        """Execute a command with pipe I/O redirection."""
+        """Execute a command with pipe I/O redirection.
+
+        An input redirect on the command takes precedence over the pipe stdin.
+        """
+        if command.input_redirect is None:
+            return self._dispatch(command, stdin, stdout, stderr, context)
+
+        # Nothing will read the previous stage's output, so close our end of the
+        # pipe; otherwise a writer that fills it blocks forever instead of
+        # getting SIGPIPE/EPIPE
+        if stdin is not None and hasattr(stdin, "close"):
+            stdin.close()
+        try:
+            redirected_stdin = open_input(command.input_redirect)
+        except OSError as error:
+            sys.stderr.write(f"shell: {command.input_redirect.source}: {error.strerror}\n")
+            sys.stderr.flush()
+            return BuiltinProcess("", needs_pipe=stdout == subprocess.PIPE, returncode=1)
+        # Children get their own copy of the fd, so it can be closed once started
+        with redirected_stdin:
+            return self._dispatch(command, redirected_stdin, stdout, stderr, context)
+
+    def _dispatch(
+        self,
+        command: "Command",
+        stdin: TextIO | None,
+        stdout: TextIO | int | None,
+        stderr: TextIO | int | None,
+        context: ShellContext | None
+    ) -> BuiltinProcess | subprocess.Popen:
         if is_builtin(command.command):
+            BUILTIN_COMMANDS.inc()
             return self._execute_builtin_with_pipe(command, stdin, stdout, stderr, context)
         return self._execute_external_with_pipe(command, stdin, stdout, stderr)
 
@@ -36,24 +76,29 @@ class PipeExecutor:
         """Execute a builtin command in a pipeline."""
         stdin_input = stdin if stdin and hasattr(stdin, "read") else None
 
-        output = builtin_handlers[command.command](
-            command.arguments,
-            stdin=stdin_input,
-            context=context
-        )
+        try:
+            output = builtin_handlers[command.command](
+                command.arguments,
+                stdin=stdin_input,
+                context=context
+            )
+        except ControlFlow:
+            # Pipeline stages act like subshells, so break/continue/return end only the stage
+            output = None
+        returncode = get_exit_status(output)
         output = output or ""
 
         # If stdout is None (last command), print to terminal
         if stdout is None:
-            print(output, end="", flush=True)
-            return BuiltinProcess(output, needs_pipe=False)
+            write_stdout(output)
+            return BuiltinProcess(output, needs_pipe=False, returncode=returncode)
         # If stdout is PIPE, create pipe for next command
         if stdout == subprocess.PIPE:
-            return BuiltinProcess(output, needs_pipe=True)
+            return BuiltinProcess(output, needs_pipe=True, returncode=returncode)
         # Otherwise, write to provided stdout
         stdout.write(output)
         stdout.flush()
-        return BuiltinProcess(output, needs_pipe=False)
+        return BuiltinProcess(output, needs_pipe=False, returncode=returncode)
 
     def _execute_external_with_pipe(
         self,
@@ -61,10 +106,24 @@ class PipeExecutor:
         stdin: TextIO | None,
         stdout: TextIO | int | None,
         stderr: TextIO | int | None
-    ) -> subprocess.Popen:
-        """Execute an external command in a pipeline."""
+    ) -> BuiltinProcess | subprocess.Popen:
+        """Execute an external command in a pipeline.
+
+        A command that can't be started reports why and stands in as a failed
+        stage, so the rest of the pipeline still runs and gets waited for.
+        """
+        needs_pipe = stdout == subprocess.PIPE
         if not command.executable_path:
-            raise FileNotFoundError(f"{command.command}: not found")
-        return subprocess.Popen(
-            **build_subprocess_kwargs(command, stdin=stdin, stdout=stdout, stderr=stderr)
-        )
+            NOT_FOUND_COMMANDS.inc()
+            sys.stderr.write(f"{command.command}: not found\n")
+            sys.stderr.flush()
+            return BuiltinProcess("", needs_pipe=needs_pipe, returncode=NOT_FOUND_STATUS)
+        EXTERNAL_COMMANDS.inc()
+        try:
+            return subprocess.Popen(
+                **build_subprocess_kwargs(command, stdin=stdin, stdout=stdout, stderr=stderr)
+            )
+        except OSError as error:
+            sys.stderr.write(f"shell: {command.command}: {error.strerror}\n")
+            sys.stderr.flush()
+            return BuiltinProcess("", needs_pipe=needs_pipe, returncode=FAILURE_STATUS)
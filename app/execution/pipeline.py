@@ -1,13 +1,23 @@
 import subprocess
 from .command import Command
 from ..models.shell_context import ShellContext
+from ..utils.metrics import metrics
+
+_PIPELINE_SECONDS = metrics.histogram(
+    "shell_pipeline_seconds", "Time from starting a pipeline until all its commands exit"
+)
 
 class Pipeline:
     """Executes a sequence of commands connected by pipes."""
     def __init__(self, commands: list[Command]):
         self.commands = commands
 
-    def execute(self, context: ShellContext | None = None) -> None:
+    def execute(self, context: ShellContext | None = None) -> int:
+        """Run all commands, returning the exit status of the last one."""
+        with _PIPELINE_SECONDS.time():
+            return self._run(context)
+
+    def _run(self, context: ShellContext | None) -> int:
         processes = []
         previous_process = None
 
@@ -28,5 +38,6 @@ class Pipeline:
             processes.append(process)
             previous_process = process
 
-        for process in processes:
+        for process in processes[:-1]:
             process.wait()
+        return processes[-1].wait()
@@ -0,0 +1,74 @@
+from dataclasses import dataclass, field
+from ..models.redirect import Redirect, InputRedirect
+from .command import Command
+
+# Nodes produced by ShellLineParser and run by Evaluator. Words may be
+# ExpandableWord instances, which are expanded each time the node runs;
+# everything else (tokenising, redirect parsing, PATH lookup) happens once
+# when the line is compiled.
+
+
+@dataclass(slots=True)
+class SimpleCommand:
+    """A single command. `command` is built once and reused on every execution."""
+    command: Command
+    arguments: list[str]
+    redirect: Redirect
+    input_redirect: InputRedirect | None
+    dynamic: bool
+
+
+@dataclass(slots=True)
+class Assignment:
+    """One or more `NAME=value` assignments with no command."""
+    assignments: list[tuple[str, str]]
+
+
+@dataclass(slots=True)
+class PipelineNode:
+    """Simple commands connected by pipes."""
+    stages: list[SimpleCommand]
+
+
+@dataclass(slots=True)
+class Sequence:
+    """Commands separated by ';' or newlines."""
+    nodes: list = field(default_factory=list)
+
+
+@dataclass(slots=True)
+class AndOr:
+    """`left && right` (is_and) or `left || right`."""
+    left: object
+    right: object
+    is_and: bool
+
+
+@dataclass(slots=True)
+class If:
+    """`if`/`elif` branches of (condition, body), with an optional `else` body."""
+    branches: list[tuple[object, object]]
+    else_body: object | None = None
+
+
+@dataclass(slots=True)
+class While:
+    """`while` loop, or `until` loop when `until` is set."""
+    condition: object
+    body: object
+    until: bool = False
+
+
+@dataclass(slots=True)
+class For:
+    """`for name in words; do body; done`. words is None for the positional parameters."""
+    name: str
+    words: list[str] | None
+    body: object
+
+
+@dataclass(slots=True)
+class FunctionDef:
+    """`name() { body; }` definition."""
+    name: str
+    body: object
@@ -1,8 +1,10 @@
 from .parsing.shell_parser import ShellLineParser
 from .parsing.redirect_parser import RedirectParser
 from .ui.repl import Repl
+from .utils.metrics import start_textfile_export_from_env
 
 def main() -> None:
+    start_textfile_export_from_env()
     redirect_parser = RedirectParser()
     command_parser = ShellLineParser(redirect_parser)
     repl = Repl(command_parser)
@@ -7,6 +7,12 @@ class RedirectionType(Enum):
     STDERR = auto()
     AUTO = auto()
 
+class InputRedirectionType(Enum):
+    """Types of input redirection."""
+    FILE = auto()
+    HEREDOC = auto()
+    HERESTRING = auto()
+
 class FileMode(Enum):
     """File write modes (write or append)."""
     WRITE = "w"
@@ -18,3 +24,16 @@ class Redirect:
     type: RedirectionType
     mode: FileMode
     file: str | None = None
+
+@dataclass
+class InputRedirect:
+    """Represents input redirection configuration.
+
+    `source` is the file path for `<`, the delimiter for `<<` and the word for `<<<`.
+    `body` holds the heredoc lines once they have been read; `expand_body` is
+    False when the delimiter was quoted (`<<'EOF'`), which turns off `$` expansion.
+    """
+    type: InputRedirectionType
+    source: str
+    body: str | None = None
+    expand_body: bool = True
@@ -1,6 +1,17 @@
 import os
+from dataclasses import dataclass, field
 from ..ui.history import History
 
+# Constants
+SPECIAL_PARAMETERS = frozenset("?#@*")
+
+@dataclass
+class Scope:
+    """State of the running function call: its arguments and the loops it is inside."""
+    positional_args: list[str] = field(default_factory=list)
+    loop_depth: int = 0
+    function_depth: int = 0
+
 class ShellContext:
     """Shell execution context containing shared state."""
 
@@ -8,3 +19,26 @@ class ShellContext:
         self.history = history
         self.working_dir = os.getcwd()
         self.env_vars = os.environ.copy()
+        self.variables: dict[str, str] = {}
+        self.functions: dict[str, object] = {}
+        self.scope = Scope()
+        self.last_status = 0
+
+    def get_variable(self, name: str) -> str:
+        """Look up a variable or special parameter, returning "" if it is unset."""
+        if name in SPECIAL_PARAMETERS or name.isdigit():
+            return self._get_special_parameter(name)
+        if name in self.variables:
+            return self.variables[name]
+        return self.env_vars.get(name, "")
+
+    def _get_special_parameter(self, name: str) -> str:
+        if name == "?":
+            return str(self.last_status)
+        args = self.scope.positional_args
+        if name == "#":
+            return str(len(args))
+        if name in ("@", "*"):
+            return " ".join(args)
+        index = int(name) - 1
+        return args[index] if 0 <= index < len(args) else ""
@@ -0,0 +1,63 @@
+import re
+from typing import Callable
+
+# Matches $name, ${name} and the special parameters $1..$9, $?, $#, $@ and $*
+_VARIABLE_PATTERN = re.compile(
+    r"\$(?:\{([A-Za-z_][A-Za-z0-9_]*|[0-9?#@*])\}|([A-Za-z_][A-Za-z0-9_]*|[0-9?#@*]))"
+)
+
+
+class ExpandableWord(str):
+    """A word containing `$` expansions.
+
+    The string value is the word with quotes removed (e.g. "$i"), so it still
+    works anywhere a plain word is expected, such as redirect parsing. The
+    expansions are split out once at construction so expanding on every loop
+    iteration is only a join.
+    """
+    segments: tuple[tuple[str, bool], ...] = ()
+
+    def __new__(cls, parts: list[tuple[str, bool]]):
+        """Create a word from (text, expandable) parts; quoted-literal parts are not expandable."""
+        word = super().__new__(cls, "".join(text for text, _ in parts))
+        word.segments = _compile_segments(parts)
+        return word
+
+    def expand(self, lookup: Callable[[str], str]) -> str:
+        """Expand the word, resolving variable names with lookup."""
+        return "".join(lookup(text) if is_variable else text for text, is_variable in self.segments)
+
+
+class QuotedWord(str):
+    """A word with no expansions that had quoting in it (e.g. 'EOF' or \\EOF).
+
+    Only matters where quoting changes meaning, such as a heredoc delimiter
+    turning off expansion of the body.
+    """
+
+
+def has_expansion(text: str) -> bool:
+    return _VARIABLE_PATTERN.search(text) is not None
+
+def expand_word(word: str, lookup: Callable[[str], str]) -> str:
+    """Expand word if it is an ExpandableWord, otherwise return it unchanged."""
+    if isinstance(word, ExpandableWord):
+        return word.expand(lookup)
+    return word
+
+def _compile_segments(parts: list[tuple[str, bool]]) -> tuple[tuple[str, bool], ...]:
+    """Split parts into (literal text, False) and (variable name, True) segments."""
+    segments = []
+    for text, expandable in parts:
+        if not expandable:
+            segments.append((text, False))
+            continue
+        position = 0
+        for match in _VARIABLE_PATTERN.finditer(text):
+            if match.start() > position:
+                segments.append((text[position:match.start()], False))
+            segments.append((match.group(1) or match.group(2), True))
+            position = match.end()
+        if position < len(text):
+            segments.append((text[position:], False))
+    return tuple(segments)
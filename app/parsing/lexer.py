@@ -0,0 +1,236 @@
+from dataclasses import dataclass
+from enum import Enum, auto
+from ..models.word import ExpandableWord, QuotedWord, has_expansion
+
+# Constants
+OPERATORS = ("&&", "||", ";", "|", "(", ")")
+OPERATOR_CHARS = frozenset(";|()&")
+WHITESPACE = frozenset(" \t")
+SINGLE_QUOTE = "'"
+DOUBLE_QUOTE = '"'
+BACKSLASH = "\\"
+COMMENT = "#"
+HEREDOC_OPERATOR = "<<"
+# Characters a backslash escapes inside double quotes; otherwise it is kept
+DOUBLE_QUOTE_ESCAPES = frozenset('"\\$`')
+
+
+class ShellSyntaxError(ValueError):
+    """Raised when a line cannot be parsed."""
+
+
+class IncompleteInputError(ShellSyntaxError):
+    """Raised when the input ends in the middle of a construct and needs more lines."""
+
+
+class TokenKind(Enum):
+    """Kinds of lexer tokens."""
+    WORD = auto()
+    OPERATOR = auto()
+    NEWLINE = auto()
+    END = auto()
+
+
+@dataclass(slots=True)
+class Token:
+    """A lexer token.
+
+    `quoted` is set if any part of a word was quoted, so `"if"` is never a
+    keyword; `unquoted_prefix` is the text before the first quote, used to
+    recognise `NAME=value` assignments. A heredoc delimiter word carries the
+    body read from the lines after it in `heredoc_body`.
+    """
+    kind: TokenKind
+    value: str = ""
+    quoted: bool = False
+    unquoted_prefix: str = ""
+    heredoc_body: str | None = None
+
+
+class Lexer:
+    """Splits a shell line into words and operators, following POSIX quoting rules."""
+
+    def tokenize(self, text: str) -> list[Token]:
+        """Tokenize text, raising IncompleteInputError on an unclosed quote or trailing '\\'.
+
+        Heredoc bodies are read at the newline ending the line that opened
+        them, so they never reach the parser as commands.
+        """
+        tokens = []
+        position = 0
+        parts = None
+        line_start = 0
+        while position < len(text):
+            char = text[position]
+            if char in WHITESPACE or char == "\n":
+                self._end_word(tokens, parts)
+                parts = None
+                position += 1
+                if char == "\n":
+                    position = self._read_heredoc_bodies(text, position, tokens[line_start:])
+                    tokens.append(Token(TokenKind.NEWLINE))
+                    line_start = len(tokens)
+            elif char == COMMENT and parts is None:
+                newline = text.find("\n", position)
+                position = len(text) if newline == -1 else newline
+            elif self._is_operator_start(text, position):
+                self._end_word(tokens, parts)
+                parts = None
+                operator = self._read_operator(text, position)
+                tokens.append(Token(TokenKind.OPERATOR, operator))
+                position += len(operator)
+            else:
+                parts = [] if parts is None else parts
+                position = self._read_word_part(text, position, parts)
+        self._end_word(tokens, parts)
+        if self._heredoc_delimiters(tokens[line_start:]):
+            raise IncompleteInputError("here-document delimited by end-of-file")
+        tokens.append(Token(TokenKind.END))
+        return tokens
+
+    def _end_word(self, tokens: list[Token], parts: list | None) -> None:
+        if parts is None:
+            return
+        token = self._make_word(parts)
+        delimiter = _attached_heredoc_delimiter(token)
+        if delimiter is None:
+            tokens.append(token)
+            return
+        # Split `<<EOF` so the parser only ever sees `<<` followed by its delimiter
+        tokens.append(Token(TokenKind.WORD, HEREDOC_OPERATOR))
+        tokens.append(Token(
+            TokenKind.WORD, delimiter, token.quoted,
+            token.unquoted_prefix[len(HEREDOC_OPERATOR):]
+        ))
+
+    def _heredoc_delimiters(self, tokens: list[Token]) -> list[Token]:
+        """Find the tokens on a line whose heredoc body follows it, in order."""
+        delimiters = []
+        for previous, token in zip([None] + tokens, tokens):
+            if token.kind != TokenKind.WORD:
+                continue
+            if previous is not None and previous.kind == TokenKind.WORD and (
+                previous.value == HEREDOC_OPERATOR and not previous.quoted
+            ):
+                delimiters.append(token)
+        return delimiters
+
+    def _read_heredoc_bodies(self, text: str, position: int, line: list[Token]) -> int:
+        """Read the bodies of heredocs opened on a line, returning the position after them."""
+        for token in self._heredoc_delimiters(line):
+            position = self._read_heredoc_body(text, position, token)
+        return position
+
+    def _read_heredoc_body(self, text: str, position: int, token: Token) -> int:
+        """Read lines up to the delimiter into the token, returning the position after it."""
+        delimiter = token.value
+        lines = []
+        while True:
+            end = text.find("\n", position)
+            line = text[position:] if end == -1 else text[position:end]
+            if line == delimiter:
+                token.heredoc_body = "".join(lines)
+                return len(text) if end == -1 else end + 1
+            if end == -1:
+                raise IncompleteInputError("here-document delimited by end-of-file")
+            lines.append(line + "\n")
+            position = end + 1
+
+    def _is_operator_start(self, text: str, position: int) -> bool:
+        if text[position] not in OPERATOR_CHARS:
+            return False
+        # A lone '&' stays part of a word so '&>' and '2>&1' reach the redirect parser
+        return text[position] != "&" or text.startswith("&&", position)
+
+    def _read_operator(self, text: str, position: int) -> str:
+        for operator in OPERATORS:
+            if text.startswith(operator, position):
+                return operator
+        raise ShellSyntaxError(f"syntax error near unexpected token `{text[position]}'")
+
+    def _read_word_part(self, text: str, position: int, parts: list) -> int:
+        """Read one quoted or unquoted part of a word, returning the new position.
+
+        Parts are (text, expandable, quoted) triples.
+        """
+        char = text[position]
+        if char == SINGLE_QUOTE:
+            end = text.find(SINGLE_QUOTE, position + 1)
+            if end == -1:
+                raise IncompleteInputError("unexpected EOF while looking for matching `''")
+            parts.append((text[position + 1:end], False, True))
+            return end + 1
+        if char == DOUBLE_QUOTE:
+            return self._read_double_quoted(text, position + 1, parts)
+        if char == BACKSLASH:
+            if position + 1 >= len(text):
+                raise IncompleteInputError("unexpected EOF after `\\'")
+            if text[position + 1] != "\n":  # Backslash-newline is a line continuation
+                parts.append((text[position + 1], False, True))
+            return position + 2
+
+        end = position
+        while end < len(text) and not self._ends_unquoted(text, end):
+            end += 1
+        parts.append((text[position:end], True, False))
+        return end
+
+    def _ends_unquoted(self, text: str, position: int) -> bool:
+        char = text[position]
+        return (
+            char in WHITESPACE
+            or char in (SINGLE_QUOTE, DOUBLE_QUOTE, BACKSLASH, "\n")
+            or self._is_operator_start(text, position)
+        )
+
+    def _read_double_quoted(self, text: str, position: int, parts: list) -> int:
+        chunk = []
+        while position < len(text):
+            char = text[position]
+            if char == DOUBLE_QUOTE:
+                parts.append(("".join(chunk), True, True))
+                return position + 1
+            if char == BACKSLASH and position + 1 < len(text):
+                escaped = text[position + 1]
+                if escaped in DOUBLE_QUOTE_ESCAPES:
+                    # Flush so an escaped '$' is never treated as an expansion
+                    parts.append(("".join(chunk), True, True))
+                    parts.append((escaped, False, True))
+                    chunk = []
+                elif escaped != "\n":
+                    chunk.append(char + escaped)
+                position += 2
+                continue
+            chunk.append(char)
+            position += 1
+        raise IncompleteInputError('unexpected EOF while looking for matching `"\'')
+
+    def _make_word(self, parts: list[tuple[str, bool, bool]]) -> Token:
+        quoted = any(is_quoted for _, _, is_quoted in parts)
+        prefix = []
+        for text, _, is_quoted in parts:
+            if is_quoted:
+                break
+            prefix.append(text)
+
+        if any(expandable and has_expansion(text) for text, expandable, _ in parts):
+            value = ExpandableWord([(text, expandable) for text, expandable, _ in parts])
+        elif quoted:
+            value = QuotedWord("".join(text for text, _, _ in parts))
+        else:
+            value = "".join(text for text, _, _ in parts)
+        return Token(TokenKind.WORD, value, quoted, "".join(prefix))
+
+
+def _attached_heredoc_delimiter(token: Token) -> str | None:
+    """Get the delimiter from a `<<EOF` word, or None if it isn't one.
+
+    Only an unquoted `<<` starts a heredoc, so `'<<EOF'` stays a literal while
+    `<<'EOF'` keeps its quoting on the delimiter (which turns off expansion).
+    """
+    if not token.unquoted_prefix.startswith(HEREDOC_OPERATOR):
+        return None
+    delimiter = token.value[len(HEREDOC_OPERATOR):]
+    if not delimiter.replace("_", "").isalnum():
+        return None
+    return QuotedWord(delimiter) if isinstance(token.value, QuotedWord) else delimiter
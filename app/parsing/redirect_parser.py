@@ -1,4 +1,12 @@
-from ..models.redirect import Redirect, RedirectionType, FileMode
+from ..models.redirect import (
+    Redirect,
+    RedirectionType,
+    FileMode,
+    InputRedirect,
+    InputRedirectionType,
+)
+from ..models.word import QuotedWord
+from .lexer import HEREDOC_OPERATOR, ShellSyntaxError
 
 class RedirectParser:
     """Parses redirection operators from command arguments."""
@@ -13,6 +21,12 @@ class RedirectParser:
             "&>": (RedirectionType.AUTO, FileMode.WRITE),
             "&>>": (RedirectionType.AUTO, FileMode.APPEND),
         }
+        self._input_redirect_map = {
+            "<": InputRedirectionType.FILE,
+            "0<": InputRedirectionType.FILE,
+            HEREDOC_OPERATOR: InputRedirectionType.HEREDOC,
+            "<<<": InputRedirectionType.HERESTRING,
+        }
 
     def parse_redirects(self, arguments: list[str]) -> tuple[Redirect, list[str]]:
         for i, arg in enumerate(arguments):
@@ -25,5 +39,40 @@ class RedirectParser:
         # No redirect found
         return Redirect(RedirectionType.AUTO, FileMode.WRITE, None), arguments
 
+    def parse_input_redirect(
+        self,
+        arguments: list[str]
+    ) -> tuple[InputRedirect | None, list[str]]:
+        """Extract the input redirects, returning the last one and the remaining arguments.
+
+        Raises ShellSyntaxError if an operator has no operand.
+        """
+        input_redirect = None
+        remaining = []
+        operands = iter(arguments)
+        for arg in operands:
+            input_type = self._parse_input_redirect_type(arg)
+            if input_type is None:
+                remaining.append(arg)
+                continue
+            operand = next(operands, None)
+            if operand is None:
+                raise ShellSyntaxError("syntax error near unexpected token `newline'")
+            expand_body = not isinstance(operand, QuotedWord)
+            input_redirect = InputRedirect(input_type, operand, expand_body=expand_body)
+        return input_redirect, remaining
+
+    def is_redirect_operator(self, argument: str) -> bool:
+        return argument in self._redirect_map or (
+            self._input_redirect_map.get(argument) == InputRedirectionType.FILE
+        )
+
     def _parse_redirect_type(self, argument: str) -> tuple[RedirectionType, FileMode]:
+        if isinstance(argument, QuotedWord):  # A quoted '>' is a literal argument
+            return RedirectionType.AUTO, FileMode.WRITE
         return self._redirect_map.get(argument, (RedirectionType.AUTO, FileMode.WRITE))
+
+    def _parse_input_redirect_type(self, argument: str) -> InputRedirectionType | None:
+        if isinstance(argument, QuotedWord):  # A quoted '<' is a literal argument
+            return None
+        return self._input_redirect_map.get(argument)
@@ -1,24 +1,284 @@
-import shlex
+import re
 from ..execution.command import Command
-from ..execution.pipeline import Pipeline
+from ..execution.syntax_tree import (
+    AndOr,
+    Assignment,
+    For,
+    FunctionDef,
+    If,
+    PipelineNode,
+    Sequence,
+    SimpleCommand,
+    While,
+)
 from ..parsing.redirect_parser import RedirectParser
+from ..parsing.lexer import Lexer, Token, TokenKind, ShellSyntaxError, IncompleteInputError
+from ..models.redirect import InputRedirectionType
+from ..models.word import ExpandableWord, has_expansion
+
+# Constants
+RESERVED_WORDS = frozenset({
+    "if", "then", "elif", "else", "fi", "for", "in", "do", "done",
+    "while", "until", "function", "{", "}",
+})
+# Backslash escapes honoured in an unquoted heredoc body
+HEREDOC_ESCAPE_PATTERN = re.compile(r"\\([$`\\])")
+NAME_PATTERN = re.compile(r"[A-Za-z_][A-Za-z0-9_]*$")
+ASSIGNMENT_PATTERN = re.compile(r"([A-Za-z_][A-Za-z0-9_]*)=")
+
 
 class ShellLineParser:
-    """Parses shell command lines into Command or Pipeline objects."""
+    """Compiles shell input into a tree of nodes for the Evaluator.
+
+    Each line is tokenised and parsed exactly once. Simple commands are
+    compiled into reusable Command objects, so loop bodies and functions are
+    never re-tokenised or re-resolved when they run again.
+    """
     def __init__(self, redirect_parser: RedirectParser):
         self.redirect_parser = redirect_parser
+        self._lexer = Lexer()
+        self._tokens: list[Token] = []
+        self._position = 0
+        self._compound_parsers = {
+            "if": self._parse_if,
+            "for": self._parse_for,
+            "while": self._parse_while,
+            "until": self._parse_while,
+            "{": self._parse_brace_group,
+        }
+
+    def parse_line(self, line: str) -> object:
+        """Compile input into a node.
+
+        Raises IncompleteInputError if the input ends inside a construct or
+        heredoc body, and ShellSyntaxError if it can't be parsed.
+        """
+        self._tokens = self._lexer.tokenize(line)
+        self._position = 0
+        return self._parse_list(frozenset())
+
+    # Token helpers
+
+    def _peek(self) -> Token:
+        return self._tokens[self._position]
+
+    def _advance(self) -> Token:
+        token = self._tokens[self._position]
+        self._position += 1
+        return token
+
+    def _peek_reserved(self) -> str | None:
+        """Get the reserved word at the current position, if there is one."""
+        token = self._peek()
+        if token.kind == TokenKind.WORD and not token.quoted and token.value in RESERVED_WORDS:
+            return token.value
+        return None
+
+    def _is_operator(self, *operators: str) -> bool:
+        token = self._peek()
+        return token.kind == TokenKind.OPERATOR and token.value in operators
+
+    def _skip_newlines(self) -> None:
+        while self._peek().kind == TokenKind.NEWLINE:
+            self._advance()
+
+    def _expect_reserved(self, word: str) -> None:
+        if self._peek_reserved() != word:
+            self._raise_unexpected()
+        self._advance()
+
+    def _expect_operator(self, operator: str) -> None:
+        if not self._is_operator(operator):
+            self._raise_unexpected()
+        self._advance()
+
+    def _raise_unexpected(self) -> None:
+        token = self._peek()
+        if token.kind == TokenKind.END:
+            raise IncompleteInputError("syntax error: unexpected end of file")
+        value = "newline" if token.kind == TokenKind.NEWLINE else token.value
+        raise ShellSyntaxError(f"syntax error near unexpected token `{value}'")
+
+    # Grammar
+
+    def _parse_list(self, terminators: frozenset[str]) -> object:
+        """Parse commands separated by ';' or newlines, up to a terminator or the end."""
+        nodes = []
+        while True:
+            self._skip_newlines()
+            if self._peek().kind == TokenKind.END:
+                if terminators:
+                    self._raise_unexpected()
+                break
+            if self._peek_reserved() in terminators:
+                break
+            nodes.append(self._parse_and_or())
+            if self._is_operator(";") or self._peek().kind == TokenKind.NEWLINE:
+                self._advance()
+            elif self._peek().kind != TokenKind.END and self._peek_reserved() not in terminators:
+                self._raise_unexpected()
+
+        if terminators and not nodes:
+            self._raise_unexpected()
+        return nodes[0] if len(nodes) == 1 else Sequence(nodes)
+
+    def _parse_and_or(self) -> object:
+        node = self._parse_pipeline()
+        while self._is_operator("&&", "||"):
+            is_and = self._advance().value == "&&"
+            self._skip_newlines()
+            node = AndOr(node, self._parse_pipeline(), is_and)
+        return node
+
+    def _parse_pipeline(self) -> object:
+        stages = [self._parse_command()]
+        while self._is_operator("|"):
+            self._advance()
+            self._skip_newlines()
+            stages.append(self._parse_command())
+        if len(stages) == 1:
+            return stages[0]
+        if not all(isinstance(stage, SimpleCommand) for stage in stages):
+            raise ShellSyntaxError("syntax error: compound commands cannot be used in a pipeline")
+        return PipelineNode(stages)
+
+    def _parse_command(self) -> object:
+        reserved = self._peek_reserved()
+        if reserved in self._compound_parsers:
+            return self._compound_parsers[reserved]()
+        if reserved == "function":
+            self._advance()
+            return self._parse_function(self._parse_name())
+        if reserved is not None or self._peek().kind != TokenKind.WORD:
+            self._raise_unexpected()
+
+        next_token = self._tokens[self._position + 1]
+        if next_token.kind == TokenKind.OPERATOR and next_token.value == "(":
+            return self._parse_function(self._parse_name())
+        return self._parse_simple_command()
+
+    def _parse_if(self) -> If:
+        self._expect_reserved("if")
+        branches = []
+        while True:
+            condition = self._parse_list(frozenset({"then"}))
+            self._expect_reserved("then")
+            body = self._parse_list(frozenset({"elif", "else", "fi"}))
+            branches.append((condition, body))
+            if self._peek_reserved() != "elif":
+                break
+            self._advance()
+
+        else_body = None
+        if self._peek_reserved() == "else":
+            self._advance()
+            else_body = self._parse_list(frozenset({"fi"}))
+        self._expect_reserved("fi")
+        return If(branches, else_body)
+
+    def _parse_for(self) -> For:
+        self._expect_reserved("for")
+        name = self._parse_name()
+        self._skip_newlines()
+
+        words = None
+        if self._peek_reserved() == "in":
+            self._advance()
+            words = []
+            while self._peek().kind == TokenKind.WORD:
+                words.append(self._advance().value)
+        if self._is_operator(";"):
+            self._advance()
+        self._skip_newlines()
+
+        self._expect_reserved("do")
+        body = self._parse_list(frozenset({"done"}))
+        self._expect_reserved("done")
+        return For(name, words, body)
+
+    def _parse_while(self) -> While:
+        until = self._advance().value == "until"
+        condition = self._parse_list(frozenset({"do"}))
+        self._expect_reserved("do")
+        body = self._parse_list(frozenset({"done"}))
+        self._expect_reserved("done")
+        return While(condition, body, until)
+
+    def _parse_brace_group(self) -> object:
+        self._expect_reserved("{")
+        body = self._parse_list(frozenset({"}"}))
+        self._expect_reserved("}")
+        return body
+
+    def _parse_function(self, name: str) -> FunctionDef:
+        if self._is_operator("("):
+            self._advance()
+            self._expect_operator(")")
+        self._skip_newlines()
+        if self._peek_reserved() not in self._compound_parsers:
+            self._raise_unexpected()
+        return FunctionDef(name, self._parse_command())
+
+    def _parse_name(self) -> str:
+        token = self._peek()
+        if token.kind != TokenKind.WORD or token.quoted or not NAME_PATTERN.match(token.value):
+            self._raise_unexpected()
+        return self._advance().value
+
+    def _parse_simple_command(self) -> SimpleCommand | Assignment:
+        tokens = []
+        while self._peek().kind == TokenKind.WORD:
+            tokens.append(self._advance())
+
+        assignments = [ASSIGNMENT_PATTERN.match(token.unquoted_prefix) for token in tokens]
+        if all(assignments):
+            return Assignment([
+                (match.group(1), _drop_prefix(token.value, match.end()))
+                for match, token in zip(assignments, tokens)
+            ])
+        # Like the input redirect itself, the last heredoc on the line wins
+        heredoc_body = next(
+            (token.heredoc_body for token in reversed(tokens) if token.heredoc_body is not None),
+            ""
+        )
+        return self._compile_simple_command([token.value for token in tokens], heredoc_body)
+
+    def _compile_simple_command(self, words: list[str], heredoc_body: str) -> SimpleCommand:
+        """Split redirects out of the words and build the reusable Command."""
+        name, *arguments = words
+        input_redirect, arguments = self.redirect_parser.parse_input_redirect(arguments)
+        redirect, arguments = self.redirect_parser.parse_redirects(arguments)
+        dynamic = any(isinstance(word, ExpandableWord) for word in words)
+        if input_redirect and input_redirect.type == InputRedirectionType.HEREDOC:
+            if input_redirect.expand_body and has_expansion(heredoc_body):
+                heredoc_body = ExpandableWord(_heredoc_parts(heredoc_body))
+                dynamic = True
+            input_redirect.body = heredoc_body
+        command = Command(name, list(arguments), redirect, input_redirect)
+        return SimpleCommand(command, arguments, redirect, input_redirect, dynamic)
 
-    def parse_line(self, line: str) -> Command | Pipeline:
-        if "|" in line:
-            return self._parse_pipeline(line)
-        return self._parse_command(line)
 
-    def _parse_pipeline(self, line: str) -> Pipeline:
-        commands = line.split("|")
-        return Pipeline([self._parse_command(command) for command in commands])
+def _drop_prefix(word: str, length: int) -> str:
+    """Remove the first length characters (all from the unquoted first part) of a word."""
+    if not isinstance(word, ExpandableWord):
+        return word[length:]
+    parts = []
+    for text, is_variable in word.segments:
+        if length >= len(text) and not is_variable:
+            length -= len(text)
+            continue
+        if length:
+            text, length = text[length:], 0
+        parts.append(("${" + text + "}", True) if is_variable else (text, False))
+    return ExpandableWord(parts)
 
-    def _parse_command(self, command: str) -> Command:
-        tokens = shlex.split(command) or [None]
-        command, *arguments = tokens
-        redirect, cleaned_arguments = self.redirect_parser.parse_redirects(arguments)
-        return Command(command, cleaned_arguments, redirect)
+def _heredoc_parts(body: str) -> list[tuple[str, bool]]:
+    """Split an unquoted heredoc body into expandable text and escaped literal characters."""
+    parts = []
+    position = 0
+    for match in HEREDOC_ESCAPE_PATTERN.finditer(body):
+        parts.append((body[position:match.start()], True))
+        parts.append((match.group(1), False))
+        position = match.end()
+    parts.append((body[position:], True))
+    return parts
@@ -1,11 +1,17 @@
 import os
 import readline
 import sys
+from ..utils.metrics import metrics
+from ..utils.output_writer import output_writer
 
 # Constants
 DEFAULT_HISTORY_LENGTH = 100
 DEFAULT_HISTORY_COUNT = 10
 
+_HISTORY_WRITE_SECONDS = metrics.histogram(
+    "shell_history_write_seconds", "Time spent writing history to a file"
+)
+
 class History:
     """Manages command history, using readline's native history."""
 
@@ -60,6 +66,7 @@ class History:
 
     def read_from_file(self, file_path: str) -> None:
         """Read history from a file and append to current history."""
+        output_writer.flush()  # The file may be a redirect target with pending writes
         try:
             with open(file_path, "r", encoding="utf-8") as file:
                 for line in file:
@@ -79,9 +86,10 @@ class History:
         """
         length = readline.get_current_history_length()
         start = 1 if mode == "w" else self._last_written_count + 1
+        output_writer.flush()  # Keep pending redirect writes ahead of ours
 
         try:
-            with open(file_path, mode, encoding="utf-8") as file:
+            with _HISTORY_WRITE_SECONDS.time(), open(file_path, mode, encoding="utf-8") as file:
                 for i in range(start, length + 1):
                     file.write(readline.get_history_item(i) + "\n")
             self._last_written_count = length
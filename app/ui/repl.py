@@ -1,18 +1,34 @@
 import sys
 import readline
+from ..builtins.handlers import ControlFlow
+from ..execution.evaluator import Evaluator
+from ..parsing.lexer import IncompleteInputError, ShellSyntaxError
 from ..parsing.shell_parser import ShellLineParser
-from ..utils.completion import get_all_completions, get_completion_result
+from ..utils.completion import (
+    CompletionContext,
+    get_all_completions,
+    get_completion_context,
+    get_completion_result,
+    get_path_completions,
+)
+from ..utils.directory_cache import DirectoryCache
 from .history import History
 from ..models.shell_context import ShellContext
 
 # Constants
 SHELL_PROMPT = "$ "
+# Only shell separators end a word, so paths reach the completer whole (with '/' and '~')
+COMPLETER_DELIMS = " \t\n;|&<>"
+CONTINUATION_PROMPT = "> "
+SYNTAX_ERROR_STATUS = 2
 
 class Repl:
     """Read-Eval-Print Loop for the shell."""
     def __init__(self, command_parser: ShellLineParser):
         self.command_parser = command_parser
+        self.evaluator = Evaluator()
         self._matches = []
+        self._directory_cache = DirectoryCache()
         self._setup_completion()
         self._last_prefix = ""
         self._tab_count = 0
@@ -20,21 +36,59 @@ class Repl:
 
     def _setup_completion(self) -> None:
         readline.set_completer(self._get_completions)
+        readline.set_completer_delims(COMPLETER_DELIMS)
         readline.parse_and_bind("tab: complete")
         readline.set_auto_history(True)
 
     def run(self) -> None:
+        prefetched_dir = None
         while True:
+            # Warm the cache for the working directory before the next TAB
+            if prefetched_dir != self.context.working_dir:
+                prefetched_dir = self.context.working_dir
+                self._directory_cache.prefetch(prefetched_dir)
             line = input(SHELL_PROMPT)
-            result = self.command_parser.parse_line(line) if line else None
-            if result:
-                result.execute(context=self.context)
+            result = self._parse(line) if line else None
+            if result is not None:
+                self._execute(result)
+
+    def _execute(self, node: object) -> None:
+        try:
+            self.evaluator.execute(node, self.context)
+        except ShellSyntaxError as error:
+            self._print_syntax_error(error)
+        except ControlFlow:
+            # Loops and functions handle these; one that escapes must not end the shell
+            pass
+
+    def _parse(self, line: str) -> object | None:
+        """Parse a line, reading continuation lines while a construct is left open."""
+        while True:
+            try:
+                return self.command_parser.parse_line(line)
+            except IncompleteInputError as error:
+                try:
+                    line += "\n" + self._read_continuation_line()
+                except EOFError:
+                    self._print_syntax_error(error)
+                    return None
+            except ShellSyntaxError as error:
+                self._print_syntax_error(error)
+                return None
+
+    def _print_syntax_error(self, error: ShellSyntaxError) -> None:
+        self.context.last_status = SYNTAX_ERROR_STATUS
+        sys.stderr.write(f"shell: {error}\n")
+        sys.stderr.flush()
+
+    def _read_continuation_line(self) -> str:
+        return input(CONTINUATION_PROMPT)
 
     def _get_completions(self, text: str, state: int) -> str | None:
         if state != 0:
             return None
 
-        self._matches = get_all_completions(text)
+        self._matches = self._find_matches(text)
         self._update_tab_count(text)
 
         if self._tab_count == 1:
@@ -43,6 +97,19 @@ class Repl:
             return self._handle_second_tab()
         return None
 
+    def _find_matches(self, text: str) -> list[str]:
+        """Find matches for text based on where the cursor is in the line."""
+        completion_context = get_completion_context(
+            readline.get_line_buffer(), readline.get_begidx()
+        )
+        if completion_context == CompletionContext.COMMAND:
+            return get_all_completions(text)
+        return get_path_completions(
+            text,
+            self._directory_cache,
+            directories_only=completion_context == CompletionContext.DIRECTORY
+        )
+
     def _update_tab_count(self, text: str) -> None:
         self._tab_count = self._tab_count + 1 if self._last_prefix == text else 1
         self._last_prefix = text
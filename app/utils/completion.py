@@ -1,20 +1,93 @@
 import os
+import re
+from enum import Enum, auto
 from ..builtins.handlers import builtin_handlers
+from ..parsing.redirect_parser import RedirectParser
+from .directory_cache import DirectoryCache
+from .metrics import metrics
+
+# Constants
+# A new command starts after any of these operators or keywords
+COMMAND_SEPARATOR_PATTERN = re.compile(r"[|;&]|\b(?:do|then|else|elif|if|while|until)\s")
+PATH_SEPARATOR = "/"
+CD_COMMAND = "cd"
+
+class CompletionContext(Enum):
+    """What kind of word is being completed at the cursor."""
+    COMMAND = auto()
+    DIRECTORY = auto()
+    PATH = auto()
+
+_redirect_parser = RedirectParser()
+_COMPLETION_SECONDS = metrics.histogram(
+    "shell_completion_seconds", "Time spent finding command completions"
+)
+_PATH_COMPLETION_SECONDS = metrics.histogram(
+    "shell_path_completion_seconds", "Time spent finding file and directory completions"
+)
 
 
 def get_all_completions(prefix: str) -> list[str]:
     """Get all completions (builtin + external), removing duplicates."""
-    builtin_matches = _get_builtin_completions(prefix)
-    external_matches = _get_external_completions(prefix)
+    with _COMPLETION_SECONDS.time():
+        builtin_matches = _get_builtin_completions(prefix)
+        external_matches = _get_external_completions(prefix)
     all_matches = builtin_matches + external_matches
     # Remove duplicates while preserving order (builtins first)
     return list(dict.fromkeys(all_matches))
 
+def get_completion_context(line_buffer: str, begidx: int) -> CompletionContext:
+    """Determine the completion context from the text before the cursor word."""
+    segment = COMMAND_SEPARATOR_PATTERN.split(line_buffer[:begidx])[-1]
+    words = segment.split()
+    if not words:
+        return CompletionContext.COMMAND
+    if _redirect_parser.is_redirect_operator(words[-1]):
+        return CompletionContext.PATH
+    if words[0] == CD_COMMAND:
+        return CompletionContext.DIRECTORY
+    return CompletionContext.PATH
+
+def get_path_completions(
+    text: str,
+    directory_cache: DirectoryCache,
+    directories_only: bool = False
+) -> list[str]:
+    """Get filesystem completions for text, with directories suffixed by '/'."""
+    with _PATH_COMPLETION_SECONDS.time():
+        return _find_path_completions(text, directory_cache, directories_only)
+
+def _find_path_completions(
+    text: str,
+    directory_cache: DirectoryCache,
+    directories_only: bool
+) -> list[str]:
+    head, _, prefix = text.rpartition(PATH_SEPARATOR)
+    if head or text.startswith(PATH_SEPARATOR):
+        head += PATH_SEPARATOR
+    directory = os.path.expanduser(head) if head else os.curdir
+
+    completions = []
+    for name, is_dir in directory_cache.get_entries(directory).items():
+        if not name.startswith(prefix):
+            continue
+        # Hidden entries are only offered when explicitly asked for
+        if name.startswith(".") and not prefix.startswith("."):
+            continue
+        if is_dir:
+            completions.append(head + name + PATH_SEPARATOR)
+        elif not directories_only:
+            completions.append(head + name)
+    return sorted(completions)
+
 def get_completion_result(matches: list[str], current_text: str) -> str | None:
     """Determine what the completer should return based on matches."""
     if not matches:
         return None
     if len(matches) == 1:
+        # Directories stay open so the user can keep descending
+        if matches[0].endswith(PATH_SEPARATOR):
+            return matches[0]
         return matches[0] + " "
 
     prefix = _find_longest_common_prefix(matches)
@@ -0,0 +1,111 @@
+import os
+import queue
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+
+# Constants
+CACHE_TTL_SECONDS = 2.0
+LATENCY_BUDGET_SECONDS = 0.05
+MAX_CACHED_DIRECTORIES = 256
+
+
+@dataclass
+class DirectoryListing:
+    """Cached result of listing a single directory."""
+    entries: dict[str, bool] = field(default_factory=dict)  # name -> is_dir
+    refreshed_at: float = 0.0
+    ready: threading.Event = field(default_factory=threading.Event)
+
+
+class DirectoryCache:
+    """Directory listing cache refreshed by a background worker thread.
+
+    Lookups never call os.listdir on the caller's thread. A stale listing is
+    returned immediately while a refresh is queued; a directory that has never
+    been listed is waited on for at most the latency budget.
+    """
+
+    def __init__(
+        self,
+        ttl: float = CACHE_TTL_SECONDS,
+        latency_budget: float = LATENCY_BUDGET_SECONDS,
+        max_directories: int = MAX_CACHED_DIRECTORIES
+    ):
+        self._ttl = ttl
+        self._latency_budget = latency_budget
+        self._max_directories = max_directories
+        self._listings: OrderedDict[str, DirectoryListing] = OrderedDict()
+        self._pending: set[str] = set()
+        self._lock = threading.Lock()
+        self._queue: queue.Queue[str] = queue.Queue()
+        threading.Thread(target=self._run, name="dir-cache", daemon=True).start()
+
+    def get_entries(self, directory: str) -> dict[str, bool]:
+        """Get the entries of a directory as a mapping of name to is-directory.
+
+        Returns an empty mapping if the directory could not be listed within
+        the latency budget.
+        """
+        directory = os.path.abspath(directory)
+        with self._lock:
+            listing = self._get_or_insert(directory)
+        if listing.ready.is_set():
+            if time.monotonic() - listing.refreshed_at > self._ttl:
+                self.prefetch(directory)
+            return listing.entries
+
+        self.prefetch(directory)
+        listing.ready.wait(self._latency_budget)
+        return listing.entries
+
+    def prefetch(self, directory: str) -> None:
+        """Queue a directory to be (re)listed by the worker thread."""
+        directory = os.path.abspath(directory)
+        with self._lock:
+            if directory in self._pending:
+                return
+            self._pending.add(directory)
+        self._queue.put(directory)
+
+    def _get_or_insert(self, directory: str) -> DirectoryListing:
+        """Get a directory's listing, marking it most recently used. Call with the lock held.
+
+        Eviction drops the least recently used listings, so the one being
+        looked up (now at the end) is never evicted.
+        """
+        listing = self._listings.get(directory)
+        if listing is None:
+            listing = DirectoryListing()
+            self._listings[directory] = listing
+            while len(self._listings) > self._max_directories:
+                self._listings.popitem(last=False)
+        else:
+            self._listings.move_to_end(directory)
+        return listing
+
+    def _run(self) -> None:
+        while True:
+            directory = self._queue.get()
+            entries = self._list_directory(directory)
+            with self._lock:
+                self._pending.discard(directory)
+                listing = self._get_or_insert(directory)
+                # Replace rather than mutate so readers never see a partial listing
+                listing.entries = entries
+                listing.refreshed_at = time.monotonic()
+            listing.ready.set()
+
+    def _list_directory(self, directory: str) -> dict[str, bool]:
+        entries = {}
+        try:
+            with os.scandir(directory) as iterator:
+                for entry in iterator:
+                    try:
+                        entries[entry.name] = entry.is_dir()
+                    except OSError:
+                        entries[entry.name] = False
+        except OSError:
+            pass
+        return entries
@@ -0,0 +1,72 @@
+import os
+import sys
+from typing import TextIO
+from ..models.redirect import InputRedirect, Redirect, RedirectionType
+from .input_source import open_input
+from .output_writer import output_writer
+
+# Constants
+STDIN_FD = 0
+REDIRECT_FDS = {RedirectionType.STDOUT: 1, RedirectionType.STDERR: 2}
+
+
+class FdRedirection:
+    """Points the shell's own standard fds at a command's redirect targets.
+
+    Used for commands that run inside the shell process, such as function
+    calls, so every builtin and child process in the body sees the redirect.
+    """
+
+    def __init__(self, redirect: Redirect, input_redirect: InputRedirect | None):
+        self._redirect = redirect
+        self._input_redirect = input_redirect
+        self._input: TextIO | None = None
+        self._saved: list[tuple[int, int]] = []
+
+    def apply(self) -> bool:
+        """Redirect the fds, returning False (after reporting why) if a target can't be opened."""
+        targets = []
+        if self._input_redirect is not None:
+            try:
+                self._input = open_input(self._input_redirect)
+            except OSError as error:
+                sys.stderr.write(f"shell: {self._input_redirect.source}: {error.strerror}\n")
+                sys.stderr.flush()
+                return False
+            targets.append((STDIN_FD, self._input.fileno()))
+
+        target_fd = REDIRECT_FDS.get(self._redirect.type)
+        if target_fd is not None and self._redirect.file:
+            try:
+                file = output_writer.open_redirect(self._redirect.file, self._redirect.mode)
+            except OSError as error:
+                self._close_input()
+                sys.stderr.write(f"shell: cannot redirect to '{self._redirect.file}': {error}\n")
+                sys.stderr.flush()
+                return False
+            targets.append((target_fd, file.fileno()))
+
+        # Buffered output written so far belongs to the old targets
+        self._flush()
+        for fd, source_fd in targets:
+            self._saved.append((fd, os.dup(fd)))
+            os.dup2(source_fd, fd)
+        return True
+
+    def restore(self) -> None:
+        """Put the original fds back."""
+        self._flush()
+        for fd, saved_fd in reversed(self._saved):
+            os.dup2(saved_fd, fd)
+            os.close(saved_fd)
+        self._saved = []
+        self._close_input()
+
+    def _flush(self) -> None:
+        output_writer.flush()
+        sys.stderr.flush()
+
+    def _close_input(self) -> None:
+        if self._input is not None:
+            self._input.close()
+            self._input = None
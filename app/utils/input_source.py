@@ -0,0 +1,52 @@
+import os
+import tempfile
+from typing import TextIO
+from ..models.redirect import InputRedirect, InputRedirectionType
+from .output_writer import output_writer
+
+# Constants
+MEMFD_NAME = "shell-input"
+# Builtins read redirected input as text; undecodable bytes become U+FFFD instead of raising
+DECODE_ERRORS = "replace"
+
+
+def open_input(redirect: InputRedirect) -> TextIO:
+    """Open the stdin for an input redirect as a real file with an fd.
+
+    `< file` opens the file itself so the child reads it directly. Heredoc and
+    here-string bodies are written once into an in-memory file, so large bodies
+    never block on pipe capacity. Raises OSError if the input can't be opened.
+    """
+    if redirect.type == InputRedirectionType.FILE:
+        # The file may be a redirect target with pending writes
+        output_writer.flush()
+        return open(  # pylint: disable=consider-using-with
+            redirect.source, "r", encoding="utf-8", errors=DECODE_ERRORS
+        )
+    if redirect.type == InputRedirectionType.HERESTRING:
+        return _open_memory_file(redirect.source + "\n")
+    return _open_memory_file(redirect.body or "")
+
+def _open_memory_file(content: str) -> TextIO:
+    """Write content to an anonymous file and return it rewound for reading."""
+    try:
+        fd = os.memfd_create(MEMFD_NAME, os.MFD_CLOEXEC)
+    except (AttributeError, OSError):
+        # No memfd on this platform; an unlinked temp file behaves the same
+        file = tempfile.TemporaryFile(  # pylint: disable=consider-using-with
+            "w+", encoding="utf-8", errors=DECODE_ERRORS
+        )
+        file.write(content)
+        file.seek(0)
+        return file
+
+    data = memoryview(content.encode("utf-8"))
+    try:
+        while data:
+            written = os.write(fd, data)
+            data = data[written:]
+        os.lseek(fd, 0, os.SEEK_SET)
+    except OSError:
+        os.close(fd)
+        raise
+    return os.fdopen(fd, "r", encoding="utf-8", errors=DECODE_ERRORS)
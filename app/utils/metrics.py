@@ -0,0 +1,223 @@
+import atexit
+import bisect
+import json
+import os
+import sys
+import threading
+import time
+from typing import Callable
+
+# Constants
+DEFAULT_LATENCY_BUCKETS = (0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0)
+DEFAULT_EXPORT_INTERVAL = 15.0
+METRICS_TEXTFILE_ENV = "SHELL_METRICS_TEXTFILE"
+METRICS_INTERVAL_ENV = "SHELL_METRICS_INTERVAL"
+
+
+class ShardedCells:
+    """Per-thread arrays of numbers that are summed on read.
+
+    Each thread only ever writes its own cells, so increments need no lock;
+    the lock is only taken the first time a thread touches the metric.
+    """
+
+    def __init__(self, size: int):
+        self._size = size
+        self._local = threading.local()
+        self._shards: list[list[float]] = []
+        self._lock = threading.Lock()
+
+    def local(self) -> list[float]:
+        try:
+            return self._local.cells
+        except AttributeError:
+            cells = [0] * self._size
+            with self._lock:
+                self._shards.append(cells)
+            self._local.cells = cells
+            return cells
+
+    def totals(self) -> list[float]:
+        with self._lock:
+            shards = list(self._shards)
+        return [sum(column) for column in zip(*shards)] if shards else [0] * self._size
+
+
+class Counter:
+    """Monotonically increasing count."""
+    kind = "counter"
+
+    def __init__(self, name: str, description: str):
+        self.name = name
+        self.description = description
+        self._cells = ShardedCells(1)
+
+    def inc(self, amount: float = 1) -> None:
+        self._cells.local()[0] += amount
+
+    def value(self) -> float:
+        return self._cells.totals()[0]
+
+
+class Histogram:
+    """Distribution of observations over fixed bucket upper bounds."""
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        description: str,
+        buckets: tuple[float, ...] = DEFAULT_LATENCY_BUCKETS
+    ):
+        self.name = name
+        self.description = description
+        self.buckets = buckets
+        # One cell per bucket, one for +Inf, then the running sum
+        self._cells = ShardedCells(len(buckets) + 2)
+
+    def observe(self, value: float) -> None:
+        cells = self._cells.local()
+        cells[bisect.bisect_left(self.buckets, value)] += 1
+        cells[-1] += value
+
+    def time(self) -> "Timer":
+        return Timer(self)
+
+    def snapshot(self) -> tuple[list[int], float]:
+        """Get cumulative bucket counts (ending with +Inf) and the sum."""
+        totals = self._cells.totals()
+        cumulative = []
+        running = 0
+        for count in totals[:-1]:
+            running += count
+            cumulative.append(running)
+        return cumulative, totals[-1]
+
+
+class Timer:
+    """Context manager recording the duration of its block in a histogram."""
+    def __init__(self, histogram: Histogram):
+        self._histogram = histogram
+        self._start = 0.0
+
+    def __enter__(self) -> "Timer":
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self._histogram.observe(time.perf_counter() - self._start)
+
+
+class MetricsRegistry:
+    """Named counters and histograms for the running shell."""
+
+    def __init__(self):
+        self._metrics: dict[str, Counter | Histogram] = {}
+        self._lock = threading.Lock()
+
+    def counter(self, name: str, description: str) -> Counter:
+        """Get the counter with this name, creating it if needed."""
+        return self._get_or_create(name, lambda: Counter(name, description))
+
+    def histogram(self, name: str, description: str) -> Histogram:
+        """Get the latency histogram with this name, creating it if needed."""
+        return self._get_or_create(name, lambda: Histogram(name, description))
+
+    def format_human(self) -> str:
+        lines = []
+        items = self._sorted_items()
+        width = max((len(name) for name, _ in items), default=0)
+        for name, metric in items:
+            if isinstance(metric, Counter):
+                lines.append(f"{name:<{width}}  {_format_number(metric.value())}\n")
+                continue
+            cumulative, total = metric.snapshot()
+            count = cumulative[-1]
+            mean_ms = total / count * 1000 if count else 0.0
+            lines.append(
+                f"{name:<{width}}  count={count} sum={total:.6f}s mean={mean_ms:.3f}ms\n"
+            )
+        return "".join(lines)
+
+    def format_json(self) -> str:
+        data = {}
+        for name, metric in self._sorted_items():
+            if isinstance(metric, Counter):
+                data[name] = {"type": metric.kind, "value": metric.value()}
+                continue
+            cumulative, total = metric.snapshot()
+            bounds = [str(bound) for bound in metric.buckets] + ["+Inf"]
+            data[name] = {
+                "type": metric.kind,
+                "count": cumulative[-1],
+                "sum": total,
+                "buckets": dict(zip(bounds, cumulative)),
+            }
+        return json.dumps(data, indent=2) + "\n"
+
+    def format_prometheus(self) -> str:
+        """Format all metrics in the Prometheus text exposition format."""
+        lines = []
+        for name, metric in self._sorted_items():
+            lines.append(f"# HELP {name} {metric.description}\n")
+            lines.append(f"# TYPE {name} {metric.kind}\n")
+            if isinstance(metric, Counter):
+                lines.append(f"{name} {_format_number(metric.value())}\n")
+                continue
+            cumulative, total = metric.snapshot()
+            bounds = [str(bound) for bound in metric.buckets] + ["+Inf"]
+            for bound, count in zip(bounds, cumulative):
+                lines.append(f'{name}_bucket{{le="{bound}"}} {count}\n')
+            lines.append(f"{name}_sum {total}\n")
+            lines.append(f"{name}_count {cumulative[-1]}\n")
+        return "".join(lines)
+
+    def write_textfile(self, path: str) -> None:
+        """Atomically write the Prometheus format to path (for a textfile collector)."""
+        temp_path = f"{path}.{os.getpid()}.tmp"
+        try:
+            with open(temp_path, "w", encoding="utf-8") as file:
+                file.write(self.format_prometheus())
+            os.replace(temp_path, path)
+        except OSError as error:
+            sys.stderr.write(f"shellstat: cannot write metrics to '{path}': {error}\n")
+            sys.stderr.flush()
+
+    def start_textfile_export(self, path: str, interval: float = DEFAULT_EXPORT_INTERVAL) -> None:
+        """Write the textfile every interval seconds from a daemon thread, and once at exit."""
+        def export_loop() -> None:
+            while True:
+                time.sleep(interval)
+                self.write_textfile(path)
+
+        threading.Thread(target=export_loop, name="metrics-export", daemon=True).start()
+        atexit.register(self.write_textfile, path)
+
+    def _sorted_items(self) -> list[tuple[str, Counter | Histogram]]:
+        with self._lock:
+            return sorted(self._metrics.items())
+
+    def _get_or_create(self, name: str, factory: Callable[[], Counter | Histogram]):
+        metric = self._metrics.get(name)
+        if metric is None:
+            with self._lock:
+                metric = self._metrics.setdefault(name, factory())
+        return metric
+
+
+def _format_number(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else str(value)
+
+def start_textfile_export_from_env() -> None:
+    """Start the Prometheus textfile export if SHELL_METRICS_TEXTFILE is set."""
+    path = os.environ.get(METRICS_TEXTFILE_ENV)
+    if not path:
+        return
+    try:
+        interval = float(os.environ.get(METRICS_INTERVAL_ENV, DEFAULT_EXPORT_INTERVAL))
+    except ValueError:
+        interval = DEFAULT_EXPORT_INTERVAL
+    metrics.start_textfile_export(path, max(interval, 1.0))
+
+
+metrics = MetricsRegistry()
@@ -1,38 +1,47 @@
-import os
 import sys
-from ..models.redirect import Redirect, RedirectionType
+from ..models.redirect import Redirect, RedirectionType, FileMode
+from .metrics import metrics
+from .output_writer import output_writer
 
-
-def _ensure_directory_exists(filepath: str) -> None:
-    """Ensure the directory for a filepath exists, creating it if necessary."""
-    directory = os.path.dirname(filepath)
-    if directory:  # Only create if directory path is not empty
-        os.makedirs(directory, exist_ok=True)
+_OUTPUT_BYTES = metrics.counter(
+    "shell_output_bytes_total", "Bytes of builtin output written to stdout or redirect files"
+)
+_REDIRECT_WRITES = metrics.counter(
+    "shell_redirect_writes_total", "Builtin outputs written to a redirect file"
+)
 
 
 def handle_output(output: str | None, redirect: Redirect) -> None:
+    _count_output(output)
     if redirect.type == RedirectionType.STDOUT:
         if redirect.file:
-            _write_to_file(output or "", redirect.file, redirect.mode.value)
+            _write_to_file(output or "", redirect.file, redirect.mode)
         else:
             _print_to_stdout(output)
     elif redirect.type == RedirectionType.STDERR:
         if redirect.file:
-            _write_to_file("", redirect.file, redirect.mode.value)  # Empty file
+            _write_to_file("", redirect.file, redirect.mode)  # Empty file
         _print_to_stdout(output)  # Always print to stdout
     else:  # AUTO
         _print_to_stdout(output)
 
-def _write_to_file(content: str, filepath: str, mode: str) -> None:
+def write_stdout(output: str | None) -> None:
+    """Write builtin output straight to stdout, as the last stage of a pipeline does."""
+    _count_output(output)
+    _print_to_stdout(output)
+
+def _count_output(output: str | None) -> None:
+    if output:
+        _OUTPUT_BYTES.inc(len(output.encode()))
+
+def _write_to_file(content: str, filepath: str, mode: FileMode) -> None:
+    _REDIRECT_WRITES.inc()
     try:
-        _ensure_directory_exists(filepath)
-        with open(filepath, mode, encoding="utf-8") as file:
-            file.write(content)
-            file.flush()
+        output_writer.write_file(content, filepath, mode)
     except (PermissionError, OSError) as error:
+        output_writer.close()
         sys.stderr.write(f"shell: cannot write to '{filepath}': {error}\n")
         sys.stderr.flush()
 
 def _print_to_stdout(output: str | None) -> None:
-    if output:
-        print(output, end="", flush=True)
+    output_writer.write_stdout(output)
@@ -0,0 +1,118 @@
+import atexit
+import os
+import stat
+import sys
+from collections import OrderedDict
+from typing import TextIO
+from ..models.redirect import FileMode
+
+# Constants
+MAX_OPEN_REDIRECTS = 16
+
+
+def _ensure_directory_exists(filepath: str) -> None:
+    """Ensure the directory for a filepath exists, creating it if necessary."""
+    directory = os.path.dirname(filepath)
+    if directory:  # Only create if directory path is not empty
+        os.makedirs(directory, exist_ok=True)
+
+
+class OutputWriter:
+    """Shell-wide buffered output for builtins and redirect targets.
+
+    stdout is line-buffered on a TTY and block-buffered otherwise. Redirect
+    targets are kept open in an LRU cache so repeated `>>` to the same file
+    costs a stat instead of makedirs plus open.
+    """
+
+    def __init__(self, max_open_files: int = MAX_OPEN_REDIRECTS):
+        self._max_open_files = max_open_files
+        self._files: OrderedDict[str, TextIO] = OrderedDict()
+        if hasattr(sys.stdout, "reconfigure"):
+            sys.stdout.reconfigure(line_buffering=sys.stdout.isatty())
+        atexit.register(self.close)
+
+    def write_stdout(self, output: str | None) -> None:
+        if output:
+            sys.stdout.write(output)
+
+    def write_file(self, content: str, filepath: str, mode: FileMode) -> None:
+        """Write content to a redirect target, truncating first in write mode."""
+        file = self.open_redirect(filepath, mode)
+        if content:
+            file.write(content)
+
+    def open_redirect(self, filepath: str, mode: FileMode) -> TextIO:
+        """Get an open file for a redirect target, reusing a cached one if still valid.
+
+        Files are always opened for appending, so writes land at the end even
+        if another process appended in between; write mode truncates instead
+        of reopening.
+        """
+        key = os.path.abspath(filepath)
+        file = self._files.get(key)
+        if file is not None and not self._is_still_valid(key, file):
+            self._close_file(key)
+            file = None
+
+        if file is None:
+            _ensure_directory_exists(filepath)
+            # Kept open across commands on purpose; closed by close() or eviction
+            file = open(  # pylint: disable=consider-using-with
+                key, FileMode.APPEND.value, encoding="utf-8"
+            )
+            self._files[key] = file
+            self._evict_least_recent()
+        else:
+            self._files.move_to_end(key)
+
+        # Devices such as /dev/null can't be truncated and don't need it
+        if mode == FileMode.WRITE and stat.S_ISREG(os.fstat(file.fileno()).st_mode):
+            file.truncate(0)
+        return file
+
+    def flush(self) -> None:
+        """Flush stdout and every cached redirect target.
+
+        This is the one hook for anything that could observe buffered data:
+        it must be called before starting a child process (which shares our
+        stdout and may read a redirect target) and before the shell itself
+        reads or writes a file that may be one.
+        """
+        sys.stdout.flush()
+        for file in self._files.values():
+            file.flush()
+
+    def close(self) -> None:
+        """Flush stdout and close every cached redirect target."""
+        try:
+            sys.stdout.flush()
+        except (OSError, ValueError):
+            pass
+        for key in list(self._files):
+            self._close_file(key)
+
+    def _is_still_valid(self, key: str, file: TextIO) -> bool:
+        """Check the cached file is still the one at its path (not deleted or replaced)."""
+        try:
+            path_stat = os.stat(key)
+            file_stat = os.fstat(file.fileno())
+        except (OSError, ValueError):
+            return False
+        return (path_stat.st_dev, path_stat.st_ino) == (file_stat.st_dev, file_stat.st_ino)
+
+    def _evict_least_recent(self) -> None:
+        while len(self._files) > self._max_open_files:
+            key = next(iter(self._files))
+            self._close_file(key)
+
+    def _close_file(self, key: str) -> None:
+        file = self._files.pop(key)
+        try:
+            file.close()
+        except OSError as error:
+            sys.stderr.write(f"shell: cannot write to '{key}': {error}\n")
+            sys.stderr.flush()
+
+
+output_writer = OutputWriter()
@@ -1,12 +1,18 @@
 import os
+from .metrics import metrics
+
+_PATH_SCANS = metrics.counter("shell_path_scans_total", "PATH scans for an executable")
+_PATH_SCAN_SECONDS = metrics.histogram("shell_path_scan_seconds", "Time spent scanning PATH")
 
 def get_executable_path(command: str) -> str | None:
     paths = os.environ.get("PATH")
     if not paths:
         raise ValueError("PATH environment variable is not set")
-    paths = paths.split(":")
-    for path_dir in paths:
-        joined_path = os.path.join(path_dir, command)
-        if os.path.exists(joined_path) and os.access(joined_path, os.X_OK):
-            return joined_path
+    _PATH_SCANS.inc()
+    with _PATH_SCAN_SECONDS.time():
+        paths = paths.split(":")
+        for path_dir in paths:
+            joined_path = os.path.join(path_dir, command)
+            if os.path.exists(joined_path) and os.access(joined_path, os.X_OK):
+                return joined_path
     return None
@@ -1,4 +1,5 @@
 from typing import TextIO, TYPE_CHECKING
+from .output_writer import output_writer
 
 if TYPE_CHECKING:
     from ..execution.command import Command
@@ -10,7 +11,12 @@ def build_subprocess_kwargs(
     stdout: TextIO | int | None = None,
     stderr: TextIO | int | None = None
 ) -> dict:
-    """Build subprocess arguments for external commands."""
+    """Build subprocess arguments for external commands.
+
+    Flushes the shell's buffered output first, since every caller is about
+    to start a child process.
+    """
+    output_writer.flush()
     return {
         "args": [command.command] + command.arguments,
         "executable": command.executable_path,
@@ -0,0 +1,48 @@
+"""Loop throughput benchmark.
+
+Runs a `for` loop through the compiled syntax tree and compares it with
+re-parsing the loop body on every iteration (what running it line by line
+would cost). Run from the repository root:
+
+    uv run python -m benchmarks.loop_throughput [iterations]
+"""
+import sys
+import time
+from app.execution.evaluator import Evaluator
+from app.models.shell_context import ShellContext
+from app.parsing.redirect_parser import RedirectParser
+from app.parsing.shell_parser import ShellLineParser
+from app.ui.history import History
+
+# Constants
+DEFAULT_ITERATIONS = 100_000
+LOOP_BODY = "x=$i; echo $x >> /dev/null"
+
+
+def _time_compiled(parser: ShellLineParser, context: ShellContext, iterations: int) -> float:
+    words = " ".join(str(i) for i in range(iterations))
+    start = time.perf_counter()
+    node = parser.parse_line(f"for i in {words}; do {LOOP_BODY}; done")
+    Evaluator().execute(node, context)
+    return time.perf_counter() - start
+
+def _time_reparsed(parser: ShellLineParser, context: ShellContext, iterations: int) -> float:
+    evaluator = Evaluator()
+    start = time.perf_counter()
+    for i in range(iterations):
+        context.variables["i"] = str(i)
+        evaluator.execute(parser.parse_line(LOOP_BODY), context)
+    return time.perf_counter() - start
+
+def main() -> None:
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_ITERATIONS
+    parser = ShellLineParser(RedirectParser())
+    context = ShellContext(History())
+
+    for label, timer in (("compiled", _time_compiled), ("re-parsed", _time_reparsed)):
+        elapsed = timer(parser, context, iterations)
+        print(f"{label:>10}: {iterations} iterations in {elapsed:.3f}s "
+              f"({iterations / elapsed:,.0f} iterations/s)")
+
+if __name__ == "__main__":
+    main()